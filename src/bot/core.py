@@ -406,17 +406,17 @@ class ClaudeCodeBot:
             "Finalizing running tasks before shutdown", count=len(running_tasks)
         )
 
-        for active in running_tasks:
-            try:
-                await task_registry.cancel(active.user_id, scope_key=active.scope_key)
-            except Exception as exc:
-                logger.warning(
-                    "Failed to cancel running task during shutdown",
-                    user_id=active.user_id,
-                    scope_key=active.scope_key,
-                    error=str(exc),
-                )
+        # Cancel everything before waiting, so stuck tasks share one timeout.
+        try:
+            await task_registry.cancel_all()
+        except Exception as exc:
+            logger.warning(
+                "Failed to cancel running tasks during shutdown",
+                count=len(running_tasks),
+                error=str(exc),
+            )
 
+        for active in running_tasks:
             if active.chat_id and active.progress_message_id:
                 try:
                     await self.app.bot.edit_message_text(
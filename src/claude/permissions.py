@@ -357,6 +357,8 @@ class PermissionManager:
         session_id: str,
     ) -> None:
         """Store latest resolution metadata for stale button explanations."""
+        # Re-insert so the size cap below always evicts the oldest update.
+        self.request_resolution_cache.pop(request_id, None)
         self.request_resolution_cache[request_id] = {
             "status": status,
             "decision": decision,
@@ -1,7 +1,8 @@
 """Task registry for managing active Claude tasks per user.
 
 Enables task cancellation by tracking asyncio.Task instances
-and providing thread-safe state transitions.
+and providing state transitions. All mutations are synchronous dict
+operations on the event loop thread, so no lock is needed.
 """
 
 import asyncio
@@ -9,12 +10,15 @@ import copy
 import enum
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 import structlog
 
 logger = structlog.get_logger()
 
+# Upper bound for waiting on cancelled tasks to finish unwinding.
+CANCEL_WAIT_TIMEOUT_SECONDS = 5.0
+
 
 class TaskState(enum.Enum):
     RUNNING = "running"
@@ -23,7 +27,7 @@ class TaskState(enum.Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class ActiveTask:
     user_id: int
     task: asyncio.Task
@@ -36,19 +40,30 @@ class ActiveTask:
 
 
 class TaskRegistry:
-    """Manage active Claude tasks per user. Thread-safe via asyncio.Lock."""
+    """Manage active Claude tasks per user.
+
+    Methods stay async for API stability, but never await while touching
+    registry state, so they are atomic with respect to other coroutines.
+    """
 
     def __init__(self) -> None:
-        self._tasks: Dict[str, ActiveTask] = {}
-        self._lock = asyncio.Lock()
+        # user_id -> task key -> task, so per-user operations never scan
+        # other users' tasks.
+        self._tasks: Dict[int, Dict[str, ActiveTask]] = {}
 
     def _task_key(self, user_id: int, scope_key: Optional[str]) -> str:
         """Get internal task key (scope-first, user fallback)."""
         return scope_key or f"user:{user_id}"
 
-    def _user_task_keys(self, user_id: int) -> list[str]:
-        """Get all task keys that belong to a user."""
-        return [k for k, t in self._tasks.items() if t.user_id == user_id]
+    def _targets(self, user_id: int, scope_key: Optional[str]) -> list[ActiveTask]:
+        """Get tasks addressed by a scoped or user-wide operation."""
+        user_tasks = self._tasks.get(user_id)
+        if not user_tasks:
+            return []
+        if scope_key:
+            active = user_tasks.get(self._task_key(user_id, scope_key))
+            return [active] if active else []
+        return list(user_tasks.values())
 
     async def register(
         self,
@@ -59,99 +74,105 @@ class TaskRegistry:
         chat_id: Optional[int] = None,
         scope_key: Optional[str] = None,
     ) -> None:
-        async with self._lock:
-            self._tasks[self._task_key(user_id, scope_key)] = ActiveTask(
-                user_id=user_id,
-                task=task,
-                prompt_summary=prompt_summary[:100],
-                progress_message_id=progress_message_id,
-                chat_id=chat_id,
-                scope_key=scope_key,
-            )
+        user_tasks = self._tasks.setdefault(user_id, {})
+        user_tasks[self._task_key(user_id, scope_key)] = ActiveTask(
+            user_id=user_id,
+            task=task,
+            prompt_summary=prompt_summary[:100],
+            progress_message_id=progress_message_id,
+            chat_id=chat_id,
+            scope_key=scope_key,
+        )
 
     async def cancel(self, user_id: int, scope_key: Optional[str] = None) -> bool:
-        """Cancel the user's active task. Returns True if cancelled."""
-        async with self._lock:
-            if scope_key:
-                targets = [self._task_key(user_id, scope_key)]
-            else:
-                targets = self._user_task_keys(user_id)
-
-            cancelled = False
-            for key in targets:
-                active = self._tasks.get(key)
-                if not active or active.state != TaskState.RUNNING:
-                    continue
-                active.state = TaskState.CANCELLED
-                active.task.cancel()
-                cancelled = True
-
-            if not cancelled:
-                return False
+        """Cancel the user's active task. Returns True if cancelled.
+
+        Waits (bounded) for the cancelled tasks to finish unwinding so the
+        registry no longer reports them as pending once this returns.
+        """
+        cancelled = await self._cancel_targets(self._targets(user_id, scope_key))
+        if cancelled:
             logger.info("Task cancelled", user_id=user_id, scope_key=scope_key)
-            return True
+        return cancelled > 0
+
+    async def cancel_all(self) -> int:
+        """Cancel every running task and wait for them together.
+
+        Returns the number of tasks cancelled. A single bounded wait covers
+        all of them, so shutdown is not delayed once per stuck task.
+        """
+        targets = [
+            active
+            for user_tasks in self._tasks.values()
+            for active in user_tasks.values()
+        ]
+        cancelled = await self._cancel_targets(targets)
+        if cancelled:
+            logger.info("All running tasks cancelled", count=cancelled)
+        return cancelled
+
+    async def _cancel_targets(self, targets: list[ActiveTask]) -> int:
+        """Cancel running targets, then wait once for them to unwind."""
+        cancelled: list[asyncio.Task] = []
+        for active in targets:
+            if active.state != TaskState.RUNNING:
+                continue
+            active.state = TaskState.CANCELLED
+            active.task.cancel()
+            cancelled.append(active.task)
+
+        # Task owners call remove() while unwinding, which is safe here.
+        current = asyncio.current_task()
+        pending = [task for task in cancelled if task is not current]
+        if pending:
+            await asyncio.wait(pending, timeout=CANCEL_WAIT_TIMEOUT_SECONDS)
+        return len(cancelled)
 
     async def complete(self, user_id: int, scope_key: Optional[str] = None) -> None:
-        async with self._lock:
-            keys = (
-                [self._task_key(user_id, scope_key)]
-                if scope_key
-                else self._user_task_keys(user_id)
-            )
-            for key in keys:
-                active = self._tasks.get(key)
-                if active and active.state == TaskState.RUNNING:
-                    active.state = TaskState.COMPLETED
+        for active in self._targets(user_id, scope_key):
+            if active.state == TaskState.RUNNING:
+                active.state = TaskState.COMPLETED
 
     async def fail(self, user_id: int, scope_key: Optional[str] = None) -> None:
-        async with self._lock:
-            keys = (
-                [self._task_key(user_id, scope_key)]
-                if scope_key
-                else self._user_task_keys(user_id)
-            )
-            for key in keys:
-                active = self._tasks.get(key)
-                if active and active.state == TaskState.RUNNING:
-                    active.state = TaskState.FAILED
+        for active in self._targets(user_id, scope_key):
+            if active.state == TaskState.RUNNING:
+                active.state = TaskState.FAILED
 
     async def remove(self, user_id: int, scope_key: Optional[str] = None) -> None:
-        async with self._lock:
-            if scope_key:
-                self._tasks.pop(self._task_key(user_id, scope_key), None)
-                return
-            for key in self._user_task_keys(user_id):
-                self._tasks.pop(key, None)
+        if not scope_key:
+            self._tasks.pop(user_id, None)
+            return
+        user_tasks = self._tasks.get(user_id)
+        if user_tasks is None:
+            return
+        user_tasks.pop(self._task_key(user_id, scope_key), None)
+        if not user_tasks:
+            del self._tasks[user_id]
 
     async def get(
         self, user_id: int, scope_key: Optional[str] = None
     ) -> Optional[ActiveTask]:
-        async with self._lock:
-            if scope_key:
-                active = self._tasks.get(self._task_key(user_id, scope_key))
-                return copy.copy(active) if active else None
-
-            keys = self._user_task_keys(user_id)
-            if not keys:
-                return None
-            return copy.copy(self._tasks[keys[0]])
+        targets = self._targets(user_id, scope_key)
+        return copy.copy(targets[0]) if targets else None
 
     async def is_busy(self, user_id: int, scope_key: Optional[str] = None) -> bool:
-        async with self._lock:
-            if scope_key:
-                active = self._tasks.get(self._task_key(user_id, scope_key))
-                return active is not None and active.state == TaskState.RUNNING
-
-            for key in self._user_task_keys(user_id):
-                if self._tasks[key].state == TaskState.RUNNING:
-                    return True
-            return False
+        return any(
+            active.state == TaskState.RUNNING
+            for active in self._targets(user_id, scope_key)
+        )
+
+    def iter_running(self) -> Iterator[ActiveTask]:
+        """Lazily yield shallow copies of running tasks.
+
+        Tasks that already finished without complete()/fail() being called
+        are skipped as well. Do not await while iterating; use
+        list_running() when the registry may change mid-loop.
+        """
+        for user_tasks in self._tasks.values():
+            for active in user_tasks.values():
+                if active.state == TaskState.RUNNING and not active.task.done():
+                    yield copy.copy(active)
 
     async def list_running(self) -> list[ActiveTask]:
         """Return shallow copies of all running tasks."""
-        async with self._lock:
-            return [
-                copy.copy(active)
-                for active in self._tasks.values()
-                if active.state == TaskState.RUNNING
-            ]
+        return list(self.iter_running())
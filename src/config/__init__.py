@@ -1,6 +1,7 @@
 """Configuration module."""
 
-from .environments import DevelopmentConfig, ProductionConfig, TestingConfig
+from typing import Any
+
 from .features import FeatureFlags
 from .loader import create_test_config, load_config
 from .settings import Settings
@@ -14,3 +15,14 @@ __all__ = [
     "TestingConfig",
     "FeatureFlags",
 ]
+
+_LAZY_ENVIRONMENT_CONFIGS = {"DevelopmentConfig", "ProductionConfig", "TestingConfig"}
+
+
+def __getattr__(name: str) -> Any:
+    """Import environment override classes on first access."""
+    if name in _LAZY_ENVIRONMENT_CONFIGS:
+        from . import environments
+
+        return getattr(environments, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,21 @@
 """Environment-specific configuration overrides."""
 
+from functools import lru_cache
 from typing import Any, Dict
 
 
+@lru_cache(maxsize=None)
+def _config_values(config_cls: type) -> Dict[str, Any]:
+    """Collect public config attributes once per class (callers get copies)."""
+    return {
+        key: value
+        for key, value in config_cls.__dict__.items()
+        if not key.startswith("_")
+        and not callable(value)
+        and not isinstance(value, classmethod)
+    }
+
+
 class DevelopmentConfig:
     """Development environment overrides."""
 
@@ -15,13 +28,7 @@ class DevelopmentConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_config_values(cls))
 
 
 class TestingConfig:
@@ -38,13 +45,7 @@ class TestingConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_config_values(cls))
 
 
 class ProductionConfig:
@@ -59,10 +60,4 @@ class ProductionConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_config_values(cls))
@@ -9,7 +9,6 @@ from dotenv import load_dotenv
 
 from src.exceptions import ConfigurationError, InvalidConfigError
 
-from .environments import DevelopmentConfig, ProductionConfig, TestingConfig
 from .settings import Settings
 
 logger = structlog.get_logger()
@@ -79,6 +78,8 @@ def load_config(
 
 def _apply_environment_overrides(settings: Settings, env: Optional[str]) -> Settings:
     """Apply environment-specific configuration overrides."""
+    from .environments import DevelopmentConfig, ProductionConfig, TestingConfig
+
     overrides = {}
 
     if env == "development":
@@ -152,6 +153,8 @@ def create_test_config(**overrides: Any) -> Settings:
     Returns:
         Settings instance configured for testing
     """
+    from .environments import TestingConfig
+
     # Start with testing defaults
     test_values = TestingConfig.as_dict()
 
@@ -2,13 +2,16 @@
 
 import argparse
 import asyncio
+import atexit
 import logging
+import queue
 import re
 import shutil
 import signal
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import structlog
 
@@ -44,17 +47,27 @@ from src.services import (
 from src.storage.facade import Storage
 from src.storage.session_storage import SQLiteSessionStorage
 
-_TELEGRAM_BOT_TOKEN_IN_URL_RE = re.compile(
-    r"(https?://api\.telegram\.org/bot)([^/\s]+)"
+_TELEGRAM_SECRET_RE = re.compile(
+    r"(?P<url>https?://api\.telegram\.org/bot)[^/\s]+"
+    r"|(?P<token>\b\d{6,}:[A-Za-z0-9_-]{20,}\b)"
 )
-_TELEGRAM_BOT_TOKEN_RAW_RE = re.compile(r"\b\d{6,}:[A-Za-z0-9_-]{20,}\b")
+_TOKEN_PREFIX_RE = re.compile(r"\d{6}:")
+
+
+def _redact_match(match: re.Match[str]) -> str:
+    url_prefix = match.group("url")
+    if url_prefix is not None:
+        return f"{url_prefix}<redacted>"
+    return "<redacted_token>"
 
 
 def redact_sensitive_text(text: str) -> str:
     """Redact sensitive tokens from log text."""
-    redacted = _TELEGRAM_BOT_TOKEN_IN_URL_RE.sub(r"\1<redacted>", text)
-    redacted = _TELEGRAM_BOT_TOKEN_RAW_RE.sub("<redacted_token>", redacted)
-    return redacted
+    # Skip the regex unless the text names the Telegram API host or has a
+    # bot id followed by a colon; timestamps such as 12:30 never match.
+    if "telegram.org" not in text and not _TOKEN_PREFIX_RE.search(text):
+        return text
+    return _TELEGRAM_SECRET_RE.sub(_redact_match, text)
 
 
 class SensitiveLogFilter(logging.Filter):
@@ -70,21 +83,43 @@ class SensitiveLogFilter(logging.Filter):
         return True
 
 
+_log_listener: Optional[QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Flush queued records and stop the background log listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 def setup_logging(debug: bool = False) -> None:
     """Configure structured logging."""
+    global _log_listener
     level = logging.DEBUG if debug else logging.INFO
 
+    # Output handler runs on the listener thread, so secret redaction
+    # does not block the event loop on every log call.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    stream_handler.addFilter(SensitiveLogFilter())
+
+    if _log_listener is None:
+        atexit.register(_stop_log_listener)
+    else:
+        _log_listener.stop()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+
     # Configure standard logging
     logging.basicConfig(
         level=level,
         format="%(message)s",
-        stream=sys.stdout,
+        handlers=[QueueHandler(log_queue)],
+        force=True,
     )
-    # Always apply secret redaction filter to root handlers.
-    sensitive_filter = SensitiveLogFilter()
-    root_logger = logging.getLogger()
-    for handler in root_logger.handlers:
-        handler.addFilter(sensitive_filter)
 
     # Configure structlog
     structlog.configure(
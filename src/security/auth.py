@@ -6,10 +6,12 @@ Features:
 - Audit logging
 """
 
+import heapq
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import structlog
 
@@ -19,10 +21,18 @@ from src.exceptions import SecurityError
 
 logger = structlog.get_logger()
 
+# Session clock. Tests patch this alias rather than time.monotonic, which
+# would also freeze the running event loop's clock.
+_monotonic = time.monotonic
 
-@dataclass
+
+@dataclass(slots=True)
 class UserSession:
-    """User session data."""
+    """User session data.
+
+    ``last_activity`` is a property (attached below the class) so that any
+    assignment also re-derives the monotonic time expiry checks compare.
+    """
 
     user_id: int
     auth_provider: str
@@ -30,18 +40,41 @@ class UserSession:
     last_activity: datetime
     user_info: Optional[Dict[str, Any]] = None
     session_timeout: timedelta = timedelta(hours=24)
-
-    def __post_init__(self) -> None:
-        if self.last_activity is None:
-            self.last_activity = self.created_at
+    _last_activity: datetime = field(init=False, repr=False, compare=False)
+    # Monotonic time of the last activity, so expiry checks avoid datetime
+    # math and are immune to wall-clock jumps.
+    _mono_last: float = field(init=False, repr=False, compare=False)
+
+    def _get_last_activity(self) -> datetime:
+        """Wall-clock time of the last activity."""
+        return self._last_activity
+
+    def _set_last_activity(self, value: Optional[datetime]) -> None:
+        """Record activity time and keep the monotonic timestamp in sync."""
+        if value is None:
+            value = self.created_at
+        age_seconds = (datetime.utcnow() - value).total_seconds()
+        self._last_activity = value
+        self._mono_last = _monotonic() - age_seconds
+
+    def expires_at(self) -> float:
+        """Monotonic time after which the session counts as expired."""
+        return self._mono_last + self.session_timeout.total_seconds()
 
     def is_expired(self) -> bool:
         """Check if session has expired."""
-        return datetime.utcnow() - self.last_activity > self.session_timeout
+        return _monotonic() > self.expires_at()
 
     def refresh(self) -> None:
         """Refresh session activity."""
-        self.last_activity = datetime.utcnow()
+        self._last_activity = datetime.utcnow()
+        self._mono_last = _monotonic()
+
+
+# Replaces the slot descriptor; the dataclass __init__ assigns through it.
+UserSession.last_activity = property(  # type: ignore[assignment]
+    UserSession._get_last_activity, UserSession._set_last_activity
+)
 
 
 class AuthProvider(ABC):
@@ -62,7 +95,7 @@ class WhitelistAuthProvider(AuthProvider):
     """Whitelist-based authentication."""
 
     def __init__(self, allowed_users: List[int]):
-        self.allowed_users = set(allowed_users)
+        self.allowed_users: FrozenSet[int] = frozenset(allowed_users)
         logger.info(
             "Whitelist auth provider initialized",
             allowed_users=len(self.allowed_users),
@@ -96,6 +129,12 @@ class AuthenticationManager:
 
         self.providers = providers
         self.sessions: Dict[int, UserSession] = {}
+        # Min-heap of (expiry, user_id). Entries are invalidated lazily: only
+        # the expiry recorded in _scheduled_expiry is current for a user.
+        self._expiry_heap: List[Tuple[float, int]] = []
+        self._scheduled_expiry: Dict[int, float] = {}
+        # Provider that last authenticated each user, tried first next time.
+        self._provider_cache: Dict[int, AuthProvider] = {}
         logger.info("Authentication manager initialized", providers=len(self.providers))
 
     async def authenticate_user(
@@ -107,10 +146,20 @@ class AuthenticationManager:
         # Clean expired sessions first
         self._cleanup_expired_sessions()
 
-        # Try each provider
-        for provider in self.providers:
+        # Try the provider that accepted this user last time, then the rest
+        cached_provider = self._provider_cache.pop(user_id, None)
+        providers = self.providers
+        if cached_provider is not None:
+            providers = [cached_provider] + [
+                provider
+                for provider in self.providers
+                if provider is not cached_provider
+            ]
+
+        for provider in providers:
             try:
                 if await provider.authenticate(user_id, credentials):
+                    self._provider_cache[user_id] = provider
                     await self._create_session(user_id, provider)
                     logger.info(
                         "User authenticated successfully",
@@ -139,6 +188,7 @@ class AuthenticationManager:
             last_activity=datetime.utcnow(),
             user_info=user_info,
         )
+        self._schedule_expiry(user_id, self.sessions[user_id])
 
         logger.info(
             "Session created", user_id=user_id, provider=provider.__class__.__name__
@@ -171,23 +221,39 @@ class AuthenticationManager:
 
     def end_session(self, user_id: int) -> None:
         """End user session."""
+        self._provider_cache.pop(user_id, None)
         if user_id in self.sessions:
             del self.sessions[user_id]
             logger.info("Session ended", user_id=user_id)
 
+    def _schedule_expiry(self, user_id: int, session: UserSession) -> None:
+        """Track when a session should next be checked for expiry."""
+        expires_at = session.expires_at()
+        self._scheduled_expiry[user_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, user_id))
+
     def _cleanup_expired_sessions(self) -> None:
         """Remove expired sessions."""
-        expired_sessions = [
-            user_id
-            for user_id, session in self.sessions.items()
-            if session.is_expired()
-        ]
-
-        for user_id in expired_sessions:
-            del self.sessions[user_id]
-
-        if expired_sessions:
-            logger.info("Expired sessions cleaned up", count=len(expired_sessions))
+        now = _monotonic()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, user_id = heapq.heappop(heap)
+            if self._scheduled_expiry.get(user_id) != expires_at:
+                continue  # Superseded by a newer entry.
+            del self._scheduled_expiry[user_id]
+            session = self.sessions.get(user_id)
+            if session is None:
+                continue
+            if session.is_expired():
+                del self.sessions[user_id]
+                removed += 1
+            else:
+                # Refreshed since it was scheduled; check again later.
+                self._schedule_expiry(user_id, session)
+
+        if removed:
+            logger.info("Expired sessions cleaned up", count=removed)
 
     def get_active_sessions_count(self) -> int:
         """Get count of active sessions."""
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Any, Optional
 
+_MARKDOWN_CONTROL_RE = re.compile(r"([\\`*_\[])")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ApprovalResolution:
     """Approval resolution result for callback handlers."""
 
@@ -18,6 +21,19 @@ class ApprovalResolution:
     code: str = "unknown"
 
 
+# Static failure results are frozen, so one shared instance each suffices.
+_INVALID_PARAM_RESOLUTION = ApprovalResolution(
+    ok=False,
+    code="invalid_param",
+    message="Invalid permission callback data.",
+)
+_MISSING_MANAGER_RESOLUTION = ApprovalResolution(
+    ok=False,
+    code="missing_manager",
+    message="Permission manager not available.",
+)
+
+
 class ApprovalService:
     """Provide reusable approval callback parsing and resolution logic."""
 
@@ -26,14 +42,30 @@ class ApprovalService:
         "allow_all": "Allowed (all for session)",
         "deny": "Denied",
     }
+    _EXPIRED_REASONS = {
+        "expired": "This permission request has timed out.",
+        "approved": "This permission request has already been handled.",
+        "denied": "This permission request has already been handled.",
+    }
+    _DEFAULT_EXPIRED_REASON = (
+        "This permission request has already been handled or timed out."
+    )
+    _EXPIRED_MESSAGE_TEMPLATE = (
+        "**Permission Request Expired**\n\n"
+        "{reason}\n\n"
+        "Request: `{request_id}`\n"
+        "Action: `{action}`"
+        "{context}\n"
+        "Please re-run your request if approval is still needed."
+    )
+    _RESOLVED_MESSAGE_TEMPLATE = (
+        "**Permission {label}**\n\nYour choice has been applied.{details}"
+    )
 
     @staticmethod
     def _escape_markdown_text(value: Any) -> str:
         """Escape Telegram legacy Markdown control characters."""
-        text = str(value)
-        for ch in ("\\", "`", "*", "_", "["):
-            text = text.replace(ch, f"\\{ch}")
-        return text
+        return _MARKDOWN_CONTROL_RE.sub(r"\\\1", str(value))
 
     @staticmethod
     def _format_tool_input_summary(tool_name: str, tool_input: dict[str, Any]) -> str:
@@ -68,20 +100,12 @@ class ApprovalService:
         permission_manager: Any,
     ) -> ApprovalResolution:
         """Resolve callback payload against PermissionManager."""
-        if not param or ":" not in param:
-            return ApprovalResolution(
-                ok=False,
-                code="invalid_param",
-                message="Invalid permission callback data.",
-            )
+        decision, _, request_id = (param or "").partition(":")
+        if not request_id or decision not in self._DECISION_LABELS:
+            return _INVALID_PARAM_RESOLUTION
 
-        decision, request_id = param.split(":", 1)
         if not permission_manager:
-            return ApprovalResolution(
-                ok=False,
-                code="missing_manager",
-                message="Permission manager not available.",
-            )
+            return _MISSING_MANAGER_RESOLUTION
 
         pending = None
         get_pending = getattr(permission_manager, "get_pending_request", None)
@@ -98,16 +122,10 @@ class ApprovalService:
             user_id=user_id,
         )
         if not resolved:
-            decision_label = self._DECISION_LABELS.get(decision, decision)
             status_label = str((snapshot or {}).get("status") or "").strip().lower()
-            if status_label == "expired":
-                reason_text = "This permission request has timed out."
-            elif status_label in {"approved", "denied"}:
-                reason_text = "This permission request has already been handled."
-            else:
-                reason_text = (
-                    "This permission request has already been handled or timed out."
-                )
+            reason_text = self._EXPIRED_REASONS.get(
+                status_label, self._DEFAULT_EXPIRED_REASON
+            )
             context_lines = []
             tool_name = (
                 str(pending.tool_name).strip()
@@ -146,17 +164,14 @@ class ApprovalService:
                 request_id=request_id,
                 decision=decision,
                 parse_mode="Markdown",
-                message=(
-                    "**Permission Request Expired**\n\n"
-                    f"{reason_text}\n\n"
-                    f"Request: `{request_id}`\n"
-                    f"Action: `{decision_label}`"
-                    f"{context_text}\n"
-                    "Please re-run your request if approval is still needed."
+                message=self._EXPIRED_MESSAGE_TEMPLATE.format(
+                    reason=reason_text,
+                    request_id=request_id,
+                    action=self._DECISION_LABELS[decision],
+                    context=context_text,
                 ),
             )
 
-        label = self._DECISION_LABELS.get(decision, decision)
         suffix = ""
         if pending:
             safe_tool_name = str(pending.tool_name).replace("`", "'")
@@ -174,5 +189,8 @@ class ApprovalService:
             request_id=request_id,
             decision=decision,
             parse_mode="Markdown",
-            message=f"**Permission {label}**\n\nYour choice has been applied.{suffix}",
+            message=self._RESOLVED_MESSAGE_TEMPLATE.format(
+                label=self._DECISION_LABELS[decision],
+                details=suffix,
+            ),
         )
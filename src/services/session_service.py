@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -34,8 +35,14 @@ class ContextStatusSnapshot:
 class SessionService:
     """Provide session-level reusable business capabilities."""
 
-    _codex_snapshot_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+    # Least recently used entries first, so overflow evicts from the front.
+    _codex_snapshot_cache: OrderedDict[str, tuple[float, Dict[str, Any]]] = (
+        OrderedDict()
+    )
     _codex_snapshot_ttl_seconds = 5
+    _codex_snapshot_cache_max_size = 256
+    # Clock for the snapshot cache; tests patch this instead of time.monotonic.
+    _now = staticmethod(time.monotonic)
 
     def __init__(self, storage: Storage, event_service: EventService):
         self.storage = storage
@@ -214,11 +221,12 @@ class SessionService:
         if latest_file is None:
             return None
 
-        now = time.monotonic()
+        now = SessionService._now()
         cache_entry = SessionService._codex_snapshot_cache.get(sid)
         if cache_entry:
             cached_at, cached_snapshot = cache_entry
             if now - cached_at <= SessionService._codex_snapshot_ttl_seconds:
+                SessionService._codex_snapshot_cache.move_to_end(sid)
                 return dict(cached_snapshot)
 
         try:
@@ -365,9 +373,20 @@ class SessionService:
             snapshot["reasoning_effort"] = reasoning_effort
         if rate_limits_payload:
             snapshot["rate_limits"] = rate_limits_payload
-        SessionService._codex_snapshot_cache[sid] = (now, dict(snapshot))
+        SessionService._store_codex_snapshot(sid, now, snapshot)
         return snapshot
 
+    @classmethod
+    def _store_codex_snapshot(
+        cls, sid: str, cached_at: float, snapshot: Dict[str, Any]
+    ) -> None:
+        """Cache a Codex snapshot, evicting least recently used overflow."""
+        cache = cls._codex_snapshot_cache
+        cache[sid] = (cached_at, dict(snapshot))
+        cache.move_to_end(sid)
+        while len(cache) > cls._codex_snapshot_cache_max_size:
+            cache.popitem(last=False)
+
     @classmethod
     def get_cached_codex_snapshot(cls, session_id: str) -> Optional[Dict[str, Any]]:
         """Return cached Codex snapshot if it is still fresh."""
@@ -378,9 +397,11 @@ class SessionService:
         if not entry:
             return None
         cached_at, snapshot = entry
-        if time.monotonic() - cached_at > cls._codex_snapshot_ttl_seconds:
+        current_time = cls._now()
+        if current_time - cached_at > cls._codex_snapshot_ttl_seconds:
             cls._codex_snapshot_cache.pop(sid, None)
             return None
+        cls._codex_snapshot_cache.move_to_end(sid)
         return dict(snapshot)
 
     @staticmethod
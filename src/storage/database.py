@@ -10,7 +10,7 @@ Features:
 import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncIterator, List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
 import aiosqlite
 import structlog
@@ -113,9 +113,14 @@ CREATE INDEX idx_cost_tracking_user_date ON cost_tracking(user_id, date);
 class DatabaseManager:
     """Manage database connections and initialization."""
 
-    def __init__(self, database_url: str):
-        """Initialize database manager."""
+    def __init__(self, database_url: str, connection_pragmas: Sequence[str] = ()):
+        """Initialize database manager.
+
+        ``connection_pragmas`` run on every connection the manager opens,
+        after foreign keys are enabled.
+        """
         self.database_path = self._parse_database_url(database_url)
+        self._connection_pragmas = tuple(connection_pragmas)
         self._connection_pool: List[aiosqlite.Connection] = []
         self._pool_size = 5
         self._pool_lock = asyncio.Lock()
@@ -268,6 +273,16 @@ class DatabaseManager:
                     ON session_events(created_at);
                 """,
             ),
+            (
+                5,
+                """
+                -- Composite index for filtered audit log queries; it also
+                -- serves user_id-only lookups, so the single-column one goes.
+                CREATE INDEX IF NOT EXISTS idx_audit_log_user_type_timestamp
+                    ON audit_log(user_id, event_type, timestamp);
+                DROP INDEX IF EXISTS idx_audit_log_user_id;
+                """,
+            ),
         ]
 
     async def _init_pool(self) -> None:
@@ -276,10 +291,16 @@ class DatabaseManager:
 
         async with self._pool_lock:
             for _ in range(self._pool_size):
-                conn = await aiosqlite.connect(self.database_path)
-                conn.row_factory = aiosqlite.Row
-                await conn.execute("PRAGMA foreign_keys = ON")
-                self._connection_pool.append(conn)
+                self._connection_pool.append(await self._open_connection())
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Open a connection with row access and per-connection PRAGMAs."""
+        conn = await aiosqlite.connect(self.database_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA foreign_keys = ON")
+        for pragma in self._connection_pragmas:
+            await conn.execute(pragma)
+        return conn
 
     @asynccontextmanager
     async def get_connection(self) -> AsyncIterator[aiosqlite.Connection]:
@@ -289,9 +310,7 @@ class DatabaseManager:
             if self._connection_pool:
                 conn = self._connection_pool.pop()
             else:
-                conn = await aiosqlite.connect(self.database_path)
-                conn.row_factory = aiosqlite.Row
-                await conn.execute("PRAGMA foreign_keys = ON")
+                conn = await self._open_connection()
 
         try:
             yield conn
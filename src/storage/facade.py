@@ -4,11 +4,10 @@ Provides simple API for the rest of the application.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import structlog
 
-from ..claude.integration import ClaudeResponse
 from .database import DatabaseManager
 from .models import (
     AuditLogModel,
@@ -30,6 +29,9 @@ from .repositories import (
     UserRepository,
 )
 
+if TYPE_CHECKING:
+    from ..claude.integration import ClaudeResponse
+
 logger = structlog.get_logger()
 
 
@@ -71,7 +73,7 @@ class Storage:
         user_id: int,
         session_id: str,
         prompt: str,
-        response: ClaudeResponse,
+        response: "ClaudeResponse",
         ip_address: Optional[str] = None,
     ) -> None:
         """Save complete Claude interaction."""
@@ -99,8 +101,8 @@ class Storage:
 
         # Save tool usage
         if response.tools_used:
-            for tool in response.tools_used:
-                tool_usage = ToolUsageModel(
+            tool_usages = [
+                ToolUsageModel(
                     id=None,
                     session_id=session_id,
                     message_id=message_id,
@@ -110,7 +112,9 @@ class Storage:
                     success=not response.is_error,
                     error_message=response.error_type if response.is_error else None,
                 )
-                await self.tools.save_tool_usage(tool_usage)
+                for tool in response.tools_used
+            ]
+            await self.tools.save_tool_usages(tool_usages)
 
         # Update cost tracking
         await self.costs.update_daily_cost(user_id, response.cost)
@@ -365,7 +369,7 @@ class Storage:
         session_id: str,
         prompt: str,
         message_id: int,
-        response: ClaudeResponse,
+        response: "ClaudeResponse",
     ) -> list[SessionEventModel]:
         """Build semantic events from one Claude interaction."""
         created_at = datetime.utcnow()
@@ -242,6 +242,41 @@ class SessionEventModel:
         return cls(**data)
 
 
+@dataclass
+class ApprovalRequestModel:
+    """Approval request model for the tool permission workflow."""
+
+    request_id: str
+    user_id: int
+    session_id: str
+    tool_name: str
+    status: str
+    tool_input: Optional[Dict[str, Any]] = None
+    decision: Optional[str] = None
+    created_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: aiosqlite.Row) -> "ApprovalRequestModel":
+        """Create from database row."""
+        data = dict(row)
+
+        # Parse datetime fields
+        for field in ["created_at", "resolved_at", "expires_at"]:
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+
+        # Parse JSON fields
+        if data.get("tool_input"):
+            try:
+                data["tool_input"] = json.loads(data["tool_input"])
+            except (json.JSONDecodeError, TypeError):
+                data["tool_input"] = {}
+
+        return cls(**data)
+
+
 @dataclass
 class CostTrackingModel:
     """Cost tracking data model."""
@@ -8,12 +8,13 @@ Features:
 
 import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
 from .database import DatabaseManager
 from .models import (
+    ApprovalRequestModel,
     AuditLogModel,
     CostTrackingModel,
     MessageModel,
@@ -345,6 +346,37 @@ class ToolUsageRepository:
             await conn.commit()
             return _require_lastrowid(cursor.lastrowid)
 
+    async def save_tool_usages(self, tool_usages: List[ToolUsageModel]) -> int:
+        """Save multiple tool usages and return persisted count."""
+        if not tool_usages:
+            return 0
+
+        rows = [
+            (
+                tool_usage.session_id,
+                tool_usage.message_id,
+                tool_usage.tool_name,
+                json.dumps(tool_usage.tool_input) if tool_usage.tool_input else None,
+                tool_usage.timestamp,
+                tool_usage.success,
+                tool_usage.error_message,
+            )
+            for tool_usage in tool_usages
+        ]
+
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO tool_usage
+                (session_id, message_id, tool_name, tool_input, timestamp, success, error_message)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            await conn.commit()
+
+        return len(rows)
+
     async def get_session_tool_usage(self, session_id: str) -> List[ToolUsageModel]:
         """Get tool usage for session."""
         async with self.db.get_connection() as conn:
@@ -457,15 +489,16 @@ class AuditLogRepository:
             rows = await cursor.fetchall()
             return [AuditLogModel.from_row(row) for row in rows]
 
-    async def get_events(
-        self,
-        user_id: Optional[int] = None,
-        event_type: Optional[str] = None,
-        start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None,
-        limit: int = 100,
-    ) -> List[AuditLogModel]:
-        """Get audit events with optional filters."""
+    @staticmethod
+    def _build_events_query(
+        *,
+        user_id: Optional[int],
+        event_type: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        limit: int,
+    ) -> Tuple[str, List[Any]]:
+        """Build the filtered audit event query and its parameters."""
         query = "SELECT * FROM audit_log"
         conditions: List[str] = []
         params: List[Any] = []
@@ -491,6 +524,24 @@ class AuditLogRepository:
 
         query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
+        return query, params
+
+    async def get_events(
+        self,
+        user_id: Optional[int] = None,
+        event_type: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[AuditLogModel]:
+        """Get audit events with optional filters."""
+        query, params = self._build_events_query(
+            user_id=user_id,
+            event_type=event_type,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+        )
 
         async with self.db.get_connection() as conn:
             cursor = await conn.execute(query, params)
@@ -624,6 +675,16 @@ class ApprovalRequestRepository:
             )
             await conn.commit()
 
+    async def get_request(self, request_id: str) -> Optional[ApprovalRequestModel]:
+        """Get approval request by ID."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM approval_requests WHERE request_id = ?",
+                (request_id,),
+            )
+            row = await cursor.fetchone()
+            return ApprovalRequestModel.from_row(row) if row else None
+
     async def resolve_request(
         self,
         *,
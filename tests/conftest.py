@@ -1,5 +1,8 @@
 """Pytest configuration and fixtures."""
 
+import os
+from typing import Optional
+
 import pytest
 
 
@@ -18,3 +21,14 @@ def sample_config():
         "approved_directory": "/tmp/test_projects",
         "allowed_users": [123456789],
     }
+
+
+@pytest.fixture(scope="session")
+def db_temp_root() -> Optional[str]:
+    """Parent directory for throwaway SQLite test databases.
+
+    DatabaseManager opens a separate connection per pool slot, and opens them
+    without uri=True, so neither ":memory:" nor shared-cache memory URIs give
+    the pool one database. Use tmpfs when it exists instead.
+    """
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
@@ -124,6 +124,7 @@ async def test_request_permission_persists_and_resolves_allow():
     await asyncio.sleep(0)
 
     assert allowed is True
+    assert manager.get_pending_count() == 0
     assert len(repo.requests) == 1
     request = next(iter(repo.requests.values()))
     assert request["status"] == "approved"
@@ -198,6 +199,7 @@ async def test_request_permission_timeout_persists_expired():
     )
 
     assert allowed is False
+    assert manager.get_pending_count() == 0
     assert len(repo.requests) == 1
     request = next(iter(repo.requests.values()))
     assert request["status"] == "expired"
@@ -240,3 +242,28 @@ async def test_request_permission_forwards_suggestions_to_callback():
 
     assert allowed is True
     assert captured["suggestions"] == suggestions
+
+
+def test_resolution_cache_evicts_least_recently_recorded():
+    """Re-recorded snapshots should not be evicted ahead of older ones."""
+    manager = PermissionManager(timeout_seconds=1)
+    manager.max_resolution_cache = 2
+
+    def _record(request_id: str, status: str) -> None:
+        manager._record_resolution_snapshot(
+            request_id=request_id,
+            status=status,
+            decision=None,
+            tool_name="Bash",
+            tool_input={},
+            user_id=1,
+            session_id="s1",
+        )
+
+    _record("req-1", "pending")
+    _record("req-2", "pending")
+    _record("req-1", "approved")
+    _record("req-3", "pending")
+
+    assert set(manager.request_resolution_cache) == {"req-1", "req-3"}
+    assert manager.get_resolution_snapshot("req-1")["status"] == "approved"
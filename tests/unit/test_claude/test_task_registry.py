@@ -27,7 +27,6 @@ async def test_cancel_only_current_scope_task() -> None:
     await registry.register(user_id=user_id, task=task_b, scope_key=scope_b)
 
     cancelled = await registry.cancel(user_id, scope_key=scope_a)
-    await asyncio.sleep(0)
 
     assert cancelled is True
     assert task_a.cancelled() is True
@@ -56,7 +55,6 @@ async def test_cancel_without_scope_cancels_all_user_tasks() -> None:
     await registry.register(user_id=user_2, task=task_u2, scope_key="2:-200:20")
 
     cancelled = await registry.cancel(user_1)
-    await asyncio.sleep(0)
 
     assert cancelled is True
     assert task_u1_a.cancelled() is True
@@ -86,6 +84,7 @@ async def test_list_running_returns_only_running_tasks() -> None:
     assert len(running) == 1
     assert running[0].user_id == 11
     assert running[0].scope_key == "11:-1:1"
+    assert [active.scope_key for active in registry.iter_running()] == ["11:-1:1"]
 
     task_running.cancel()
     task_done.cancel()
@@ -93,3 +92,118 @@ async def test_list_running_returns_only_running_tasks() -> None:
         await task_running
     with suppress(asyncio.CancelledError):
         await task_done
+
+
+@pytest.mark.asyncio
+async def test_remove_scope_keeps_other_user_tasks() -> None:
+    """Removing one scope should leave the user's other scopes reachable."""
+    registry = TaskRegistry()
+    task_a = asyncio.create_task(_long_running())
+    task_b = asyncio.create_task(_long_running())
+
+    await registry.register(user_id=7, task=task_a, scope_key="7:-1:1")
+    await registry.register(user_id=7, task=task_b, scope_key="7:-1:2")
+    await registry.remove(user_id=7, scope_key="7:-1:1")
+
+    assert await registry.get(7, scope_key="7:-1:1") is None
+    remaining = await registry.get(7)
+    assert remaining is not None
+    assert remaining.scope_key == "7:-1:2"
+
+    await registry.remove(user_id=7)
+    assert await registry.get(7) is None
+    assert await registry.is_busy(7) is False
+
+    for task in (task_a, task_b):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_cancel_waits_for_task_cleanup_that_removes_itself() -> None:
+    """cancel() should return after the task unwinds, even if it calls remove()."""
+    registry = TaskRegistry()
+    cleaned_up = asyncio.Event()
+
+    async def _owner() -> None:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            await registry.remove(user_id=5, scope_key="5:-1:1")
+            cleaned_up.set()
+            raise
+
+    task = asyncio.create_task(_owner())
+    await registry.register(user_id=5, task=task, scope_key="5:-1:1")
+    await asyncio.sleep(0)
+
+    assert await registry.cancel(5, scope_key="5:-1:1") is True
+    assert task.done() is True
+    assert cleaned_up.is_set()
+    assert await registry.get(5) is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_without_scope_unwinds_user_tasks_together() -> None:
+    """All of a user's tasks are cancelled before cancel() waits on any of them."""
+    registry = TaskRegistry()
+    started: list[str] = []
+    both_started = asyncio.Event()
+
+    async def _owner(name: str) -> None:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            started.append(name)
+            if len(started) == 2:
+                both_started.set()
+            # Finishes only if the sibling task was cancelled concurrently.
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            raise
+
+    task_a = asyncio.create_task(_owner("a"))
+    task_b = asyncio.create_task(_owner("b"))
+    await registry.register(user_id=3, task=task_a, scope_key="3:-1:1")
+    await registry.register(user_id=3, task=task_b, scope_key="3:-1:2")
+    await asyncio.sleep(0)
+
+    assert await registry.cancel(3) is True
+    assert task_a.cancelled() is True
+    assert task_b.cancelled() is True
+    assert sorted(started) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_waits_once_for_stuck_tasks(monkeypatch) -> None:
+    """cancel_all() should share one bounded wait across all users' tasks."""
+    monkeypatch.setattr("src.claude.task_registry.CANCEL_WAIT_TIMEOUT_SECONDS", 0.1)
+    registry = TaskRegistry()
+
+    async def _stuck() -> None:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            await asyncio.sleep(3600)
+
+    tasks = [asyncio.create_task(_stuck()) for _ in range(3)]
+    for user_id, task in enumerate(tasks, start=1):
+        await registry.register(user_id=user_id, task=task, scope_key=f"{user_id}:-1")
+    await asyncio.sleep(0)
+
+    real_wait = asyncio.wait
+    waited = []
+
+    async def _recording_wait(aws, **kwargs):
+        waited.append(set(aws))
+        return await real_wait(aws, **kwargs)
+
+    monkeypatch.setattr(asyncio, "wait", _recording_wait)
+    assert await registry.cancel_all() == 3
+    assert waited == [set(tasks)]
+    assert list(registry.iter_running()) == []
+
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
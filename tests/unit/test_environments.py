@@ -44,3 +44,15 @@ def test_config_as_dict_excludes_internals():
     for key in config_dict.keys():
         assert not key.startswith("_")
         assert not callable(getattr(DevelopmentConfig, key))
+
+
+def test_config_as_dict_returns_independent_copies():
+    """Mutating one as_dict() result must not leak into later calls."""
+    first = TestingConfig.as_dict()
+    first["debug"] = False
+    first["extra"] = "value"
+
+    second = TestingConfig.as_dict()
+
+    assert second["debug"] is True
+    assert "extra" not in second
@@ -1,7 +1,9 @@
 """Tests for logging setup and sensitive data redaction."""
 
 import logging
+from logging.handlers import QueueHandler
 
+import src.main as main_module
 from src.main import SensitiveLogFilter, redact_sensitive_text, setup_logging
 
 
@@ -47,13 +49,63 @@ def test_setup_logging_non_debug_keeps_http_client_log_level() -> None:
     """Non-debug logging should keep HTTP client logs (with redaction filter)."""
     logging.getLogger("httpx").setLevel(logging.INFO)
     logging.getLogger("httpcore").setLevel(logging.INFO)
+    root_logger = logging.getLogger()
+    original_handlers = list(root_logger.handlers)
+    original_level = root_logger.level
 
-    setup_logging(debug=False)
+    try:
+        setup_logging(debug=False)
 
-    assert logging.getLogger("httpx").level == logging.INFO
-    assert logging.getLogger("httpcore").level == logging.INFO
-    assert any(
-        isinstance(log_filter, SensitiveLogFilter)
-        for handler in logging.getLogger().handlers
-        for log_filter in handler.filters
+        assert logging.getLogger("httpx").level == logging.INFO
+        assert logging.getLogger("httpcore").level == logging.INFO
+        assert [type(handler) for handler in root_logger.handlers] == [QueueHandler]
+        listener = main_module._log_listener
+        assert listener is not None
+        assert any(
+            isinstance(log_filter, SensitiveLogFilter)
+            for handler in listener.handlers
+            for log_filter in handler.filters
+        )
+    finally:
+        main_module._stop_log_listener()
+        root_logger.handlers = original_handlers
+        root_logger.setLevel(original_level)
+
+
+def test_sensitive_log_filter_leaves_plain_record_untouched() -> None:
+    """Records without token-like content should keep their msg and args."""
+    record = logging.LogRecord(
+        name="httpx",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg="Polling %s updates",
+        args=("pending",),
+        exc_info=None,
+    )
+
+    filt = SensitiveLogFilter()
+    assert filt.filter(record) is True
+    assert record.msg == "Polling %s updates"
+    assert record.args == ("pending",)
+    assert redact_sensitive_text("no secrets here") == "no secrets here"
+
+
+def test_sensitive_log_filter_redacts_preformatted_record() -> None:
+    """Records already formatted by QueueHandler should still be redacted."""
+    record = logging.LogRecord(
+        name="httpx",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg=(
+            "HTTP Request: POST https://api.telegram.org/bot8078587979:"
+            "AAHfMFrZvAr8PdiRPtztOaOTk3Fm1pWCEJ4/getUpdates"
+        ),
+        args=None,
+        exc_info=None,
     )
+
+    assert SensitiveLogFilter().filter(record) is True
+    assert "AAHfMFrZvAr8PdiRPtztOaOTk3Fm1pWCEJ4" not in record.getMessage()
+    assert "https://api.telegram.org/bot<redacted>/getUpdates" in record.msg
@@ -50,6 +50,25 @@ class TestUserSession:
         assert not session.is_expired()
         assert session.last_activity > old_time
 
+    def test_session_expiry_uses_monotonic_clock(self, monkeypatch):
+        """Expiry should track activity age, not the absolute monotonic value."""
+        clock = {"now": 10_000_000.0}
+        monkeypatch.setattr("src.security.auth._monotonic", lambda: clock["now"])
+        session = UserSession(
+            user_id=123,
+            auth_provider="TestProvider",
+            created_at=datetime.utcnow(),
+            last_activity=datetime.utcnow(),
+        )
+
+        assert not session.is_expired()
+
+        clock["now"] += timedelta(hours=25).total_seconds()
+        assert session.is_expired()
+
+        session.refresh()
+        assert not session.is_expired()
+
 
 class TestWhitelistAuthProvider:
     """Test whitelist authentication provider."""
@@ -112,6 +131,26 @@ class TestAuthenticationManager:
         assert result is True
         assert manager.is_authenticated(789)
 
+    async def test_repeat_authentication_tries_winning_provider_first(self):
+        """Re-authentication should start with the provider that matched before."""
+        calls = []
+
+        class _RecordingProvider(WhitelistAuthProvider):
+            async def authenticate(self, user_id, credentials):
+                calls.append(self)
+                return await super().authenticate(user_id, credentials)
+
+        primary = _RecordingProvider([123])
+        secondary = _RecordingProvider([789])
+        manager = AuthenticationManager([primary, secondary])
+
+        assert await manager.authenticate_user(789) is True
+        assert calls == [primary, secondary]
+
+        calls.clear()
+        assert await manager.authenticate_user(789) is True
+        assert calls == [secondary]
+
     async def test_session_management(self, auth_manager):
         """Test session creation and management."""
         user_id = 123
@@ -143,6 +182,23 @@ class TestAuthenticationManager:
         assert not auth_manager.is_authenticated(user_id)
         assert auth_manager.get_session(user_id) is None
 
+    async def test_cleanup_keeps_refreshed_sessions(self, auth_manager, monkeypatch):
+        """Expiry cleanup should drop idle sessions but keep refreshed ones."""
+        clock = {"now": 1_000.0}
+        monkeypatch.setattr("src.security.auth._monotonic", lambda: clock["now"])
+
+        await auth_manager.authenticate_user(123)
+        await auth_manager.authenticate_user(456)
+        assert auth_manager.get_active_sessions_count() == 2
+
+        clock["now"] += timedelta(hours=12).total_seconds()
+        assert auth_manager.refresh_session(123) is True
+
+        clock["now"] += timedelta(hours=13).total_seconds()
+        assert auth_manager.get_active_sessions_count() == 1
+        assert auth_manager.is_authenticated(123)
+        assert 456 not in auth_manager.sessions
+
     async def test_session_info(self, auth_manager):
         """Test session information retrieval."""
         user_id = 123
@@ -47,6 +47,22 @@ def test_resolve_callback_rejects_invalid_param():
     assert result.message == "Invalid permission callback data."
 
 
+def test_resolve_callback_rejects_unknown_decision_without_resolving():
+    """Unknown decisions or empty request ids should not reach the manager."""
+    service = ApprovalService()
+    manager = _FakePermissionManager()
+
+    for param in ("maybe:req-1", "allow:", ":req-1"):
+        result = service.resolve_callback(
+            param=param,
+            user_id=1001,
+            permission_manager=manager,
+        )
+        assert result.code == "invalid_param"
+
+    assert manager.calls == []
+
+
 def test_resolve_callback_rejects_missing_manager():
     """Missing permission manager should return clear message."""
     service = ApprovalService()
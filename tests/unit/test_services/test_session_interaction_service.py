@@ -3,17 +3,28 @@
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from src.services import SessionInteractionService
 
+_TMP = Path("/tmp")
+_PROJECT = _TMP / "project"
+_LONG_CONTENT = "A" * 520
+_STD_SNAPSHOT = SimpleNamespace(lines=("line1", "line2"))
 
-def test_build_continue_progress_text_with_existing_session():
-    """Existing session should render continue progress text with session id."""
-    service = SessionInteractionService()
 
+@pytest.fixture(scope="module")
+def service():
+    """Share one stateless interaction service across this module."""
+    return SessionInteractionService()
+
+
+def test_build_continue_progress_text_with_existing_session(service):
+    """Existing session should render continue progress text with session id."""
     text = service.build_continue_progress_text(
         existing_session_id="session-12345678",
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
         prompt=None,
     )
 
@@ -23,14 +34,12 @@ def test_build_continue_progress_text_with_existing_session():
     assert "Continuing where you left off" in text
 
 
-def test_build_continue_progress_text_without_existing_session():
+def test_build_continue_progress_text_without_existing_session(service):
     """Missing active session should render discovery progress text."""
-    service = SessionInteractionService()
-
     text = service.build_continue_progress_text(
         existing_session_id=None,
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
         prompt=None,
     )
 
@@ -38,47 +47,43 @@ def test_build_continue_progress_text_without_existing_session():
     assert "Searching for your most recent session" in text
 
 
-def test_build_new_session_message_for_command_with_previous_session():
-    """Command new-session message should include cleared previous session hint."""
-    service = SessionInteractionService()
-
-    message = service.build_new_session_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
-        previous_session_id="session-old-1234",
-        for_callback=False,
-    )
-
-    assert "New AI Session" in message.text
-    assert "project/" in message.text
-    assert "Previous session `session-...` cleared" in message.text
-    assert message.keyboard is not None
-    assert message.keyboard[0][0][1] == "action:start_coding"
-
-
-def test_build_new_session_message_for_callback():
-    """Callback new-session message should use quick restart copy."""
-    service = SessionInteractionService()
-
+@pytest.mark.parametrize(
+    "for_callback, previous_session_id, expected_texts, button_pos, expected_cb",
+    [
+        (
+            False,
+            "session-old-1234",
+            ("New AI Session", "project/", "Previous session `session-...` cleared"),
+            (0, 0),
+            "action:start_coding",
+        ),
+        (True, None, ("Ready to help you code!",), (1, 0), "action:quick_actions"),
+    ],
+    ids=["command", "callback"],
+)
+def test_build_new_session_message(
+    service, for_callback, previous_session_id, expected_texts, button_pos, expected_cb
+):
+    """New-session message should match command and callback copy."""
     message = service.build_new_session_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
-        previous_session_id=None,
-        for_callback=True,
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
+        previous_session_id=previous_session_id,
+        for_callback=for_callback,
     )
 
-    assert "Ready to help you code!" in message.text
+    for expected in expected_texts:
+        assert expected in message.text
     assert message.keyboard is not None
-    assert message.keyboard[1][0][1] == "action:quick_actions"
+    row, col = button_pos
+    assert message.keyboard[row][col][1] == expected_cb
 
 
-def test_build_new_session_message_uses_active_engine_title():
+def test_build_new_session_message_uses_active_engine_title(service):
     """New-session title should follow active engine when provided."""
-    service = SessionInteractionService()
-
     message = service.build_new_session_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
         previous_session_id=None,
         for_callback=False,
         active_engine="codex",
@@ -87,10 +92,8 @@ def test_build_new_session_message_uses_active_engine_title():
     assert "New Codex Session" in message.text
 
 
-def test_build_end_no_active_message_for_callback():
+def test_build_end_no_active_message_for_callback(service):
     """Callback no-active message should include action buttons."""
-    service = SessionInteractionService()
-
     message = service.build_end_no_active_message(for_callback=True)
 
     assert "No Active Session" in message.text
@@ -99,13 +102,11 @@ def test_build_end_no_active_message_for_callback():
     assert message.keyboard[1][0][1] == "action:context"
 
 
-def test_build_end_success_message_for_command():
+def test_build_end_success_message_for_command(service):
     """Command end success message should include slash-command guidance."""
-    service = SessionInteractionService()
-
     message = service.build_end_success_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
         for_callback=False,
         title="Session Ended",
     )
@@ -116,43 +117,37 @@ def test_build_end_success_message_for_command():
     assert message.keyboard[0][1][1] == "action:show_projects"
 
 
-def test_build_continue_not_found_message_for_command():
-    """Command variant should include slash-command suggestions."""
-    service = SessionInteractionService()
-
+@pytest.mark.parametrize(
+    "for_callback, expected_texts, expected_first_row",
+    [
+        (
+            False,
+            ("No Session Found", "Use `/new`", "Use `/context`"),
+            ("action:new_session", "action:context"),
+        ),
+        (True, ("Use the button below",), ("action:new_session",)),
+    ],
+    ids=["command", "callback"],
+)
+def test_build_continue_not_found_message(
+    service, for_callback, expected_texts, expected_first_row
+):
+    """Command variant suggests slash commands; callback keeps button guidance."""
     message = service.build_continue_not_found_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
-        for_callback=False,
-    )
-
-    assert "No Session Found" in message.text
-    assert "Use `/new`" in message.text
-    assert "Use `/context`" in message.text
-    assert message.keyboard is not None
-    assert message.keyboard[0][0][1] == "action:new_session"
-    assert message.keyboard[0][1][1] == "action:context"
-
-
-def test_build_continue_not_found_message_for_callback():
-    """Callback variant should keep button-first guidance."""
-    service = SessionInteractionService()
-
-    message = service.build_continue_not_found_message(
-        current_dir=Path("/tmp/project"),
-        approved_directory=Path("/tmp"),
-        for_callback=True,
+        current_dir=_PROJECT,
+        approved_directory=_TMP,
+        for_callback=for_callback,
     )
 
-    assert "Use the button below" in message.text
+    for expected in expected_texts:
+        assert expected in message.text
     assert message.keyboard is not None
-    assert message.keyboard[0][0][1] == "action:new_session"
+    for col, expected_cb in enumerate(expected_first_row):
+        assert message.keyboard[0][col][1] == expected_cb
 
 
-def test_build_export_selector_message_contains_expected_buttons():
+def test_build_export_selector_message_contains_expected_buttons(service):
     """Export selector should include the three formats and cancel action."""
-    service = SessionInteractionService()
-
     message = service.build_export_selector_message("session-abcdefg")
 
     assert "Export Session" in message.text
@@ -166,49 +161,49 @@ def test_build_export_selector_message_contains_expected_buttons():
 
 def test_build_continue_callback_success_text_applies_preview_limit():
     """Success preview should truncate long callback content."""
-    content = "A" * 520
-
-    text = SessionInteractionService.build_continue_callback_success_text(content)
+    text = SessionInteractionService.build_continue_callback_success_text(_LONG_CONTENT)
 
     assert "Session Continued" in text
     assert text.endswith("...")
     assert len(text) < 600
 
 
-def test_build_context_view_spec_for_command_full_mode():
-    """Command full mode should disable event summary but keep resumable lookup."""
-    service = SessionInteractionService()
-
-    spec = service.build_context_view_spec(for_callback=False, full_mode=True)
+@pytest.mark.parametrize(
+    "for_callback, full_mode, loading_text, parse_mode, resumable, events",
+    [
+        (False, True, "⏳ 正在获取会话状态，请稍候...", None, True, False),
+        (
+            True,
+            False,
+            "**Session Context**\n\n⏳ 正在刷新状态，请稍候...",
+            "Markdown",
+            False,
+            True,
+        ),
+    ],
+    ids=["command-full", "callback"],
+)
+def test_build_context_view_spec(
+    service, for_callback, full_mode, loading_text, parse_mode, resumable, events
+):
+    """Command full mode skips event summary; callback mode refreshes with it."""
+    spec = service.build_context_view_spec(
+        for_callback=for_callback, full_mode=full_mode
+    )
 
-    assert spec.loading_text == "⏳ 正在获取会话状态，请稍候..."
-    assert spec.loading_parse_mode is None
+    assert spec.loading_text == loading_text
+    assert spec.loading_parse_mode == parse_mode
     assert spec.error_text == "❌ 获取状态失败，请稍后重试。"
-    assert spec.include_resumable is True
-    assert spec.include_event_summary is False
-
+    assert spec.include_resumable is resumable
+    assert spec.include_event_summary is events
 
-def test_build_context_view_spec_for_callback():
-    """Callback mode should keep refresh copy and event summary enabled."""
-    service = SessionInteractionService()
 
-    spec = service.build_context_view_spec(for_callback=True)
-
-    assert "正在刷新状态" in spec.loading_text
-    assert spec.loading_parse_mode == "Markdown"
-    assert spec.include_resumable is False
-    assert spec.include_event_summary is True
-
-
-def test_build_context_render_result_for_standard_mode():
+def test_build_context_render_result_for_standard_mode(service):
     """Standard context mode should return markdown single message."""
-    service = SessionInteractionService()
-    snapshot = SimpleNamespace(lines=["line1", "line2"])
-
     result = service.build_context_render_result(
-        snapshot=snapshot,
+        snapshot=_STD_SNAPSHOT,
         scope_state={},
-        approved_directory=Path("/tmp"),
+        approved_directory=_TMP,
         full_mode=False,
     )
 
@@ -217,49 +212,51 @@ def test_build_context_render_result_for_standard_mode():
     assert result.extra_texts == ()
 
 
-def test_build_context_render_result_for_full_mode_with_chunk_split():
+# Render helpers only read snapshots, so one instance serves every run.
+_FULL_SNAPSHOT = SimpleNamespace(
+    lines=["line1", "line2"],
+    precise_context={
+        "used_tokens": 33_600,
+        "total_tokens": 200_000,
+        "remaining_tokens": 166_400,
+        "used_percent": 16.8,
+        "raw_text": (
+            "### MCP Tools\n\n"
+            "| Tool | Server | Tokens |\n"
+            "|------|--------|--------|\n"
+            "| mcp__a | notion-local | 1.5k |\n"
+            "| mcp__b | notion-local | 800 |\n"
+        ),
+        "session_id": "session-1",
+        "cached": False,
+    },
+    session_info={
+        "project": "/tmp",
+        "created": "2026-02-12T10:00:00",
+        "last_used": "2026-02-12T10:05:00",
+        "cost": 0.1,
+        "turns": 1,
+        "messages": 1,
+        "expired": False,
+        "tools_used": [],
+        "model_usage": {},
+    },
+    resumable_payload=None,
+)
+
+
+def test_build_context_render_result_for_full_mode_with_chunk_split(service):
     """Full context mode should return plain-text chunks when content is long."""
-    service = SessionInteractionService()
-    snapshot = SimpleNamespace(
-        lines=["line1", "line2"],
-        precise_context={
-            "used_tokens": 33_600,
-            "total_tokens": 200_000,
-            "remaining_tokens": 166_400,
-            "used_percent": 16.8,
-            "raw_text": (
-                "### MCP Tools\n\n"
-                "| Tool | Server | Tokens |\n"
-                "|------|--------|--------|\n"
-                "| mcp__a | notion-local | 1.5k |\n"
-                "| mcp__b | notion-local | 800 |\n"
-            ),
-            "session_id": "session-1",
-            "cached": False,
-        },
-        session_info={
-            "project": "/tmp",
-            "created": "2026-02-12T10:00:00",
-            "last_used": "2026-02-12T10:05:00",
-            "cost": 0.1,
-            "turns": 1,
-            "messages": 1,
-            "expired": False,
-            "tools_used": [],
-            "model_usage": {},
-        },
-        resumable_payload=None,
-    )
     scope_state = {
-        "current_directory": Path("/tmp/project"),
+        "current_directory": _PROJECT,
         "claude_model": "sonnet",
         "claude_session_id": "session-abcdef123",
     }
 
     result = service.build_context_render_result(
-        snapshot=snapshot,
+        snapshot=_FULL_SNAPSHOT,
         scope_state=scope_state,
-        approved_directory=Path("/tmp"),
+        approved_directory=_TMP,
         full_mode=True,
         max_length=120,
     )
@@ -8,6 +8,8 @@ import pytest
 
 from src.services.session_lifecycle_service import SessionLifecycleService
 
+_PROJECT = Path("/tmp/project")
+
 
 class _FakePermissionManager:
     """Simple permission manager stub."""
@@ -19,8 +21,13 @@ class _FakePermissionManager:
         self.cleared.append(session_id)
 
 
-@pytest.mark.asyncio
-async def test_start_new_session_clears_scope_and_permissions():
+@pytest.fixture(scope="module")
+def service():
+    """Share one service without a permission manager across this module."""
+    return SessionLifecycleService()
+
+
+def test_start_new_session_clears_scope_and_permissions():
     """New session should reset scope state and clear session permissions."""
     permission_manager = _FakePermissionManager()
     service = SessionLifecycleService(permission_manager=permission_manager)
@@ -40,10 +47,8 @@ async def test_start_new_session_clears_scope_and_permissions():
     assert permission_manager.cleared == ["sess-old-123"]
 
 
-@pytest.mark.asyncio
-async def test_end_session_handles_missing_active_session():
+def test_end_session_handles_missing_active_session(service):
     """End session should return no-op when no active session exists."""
-    service = SessionLifecycleService(permission_manager=_FakePermissionManager())
     scope_state = {"claude_session_id": None}
 
     result = service.end_session(scope_state)
@@ -52,8 +57,7 @@ async def test_end_session_handles_missing_active_session():
     assert result.ended_session_id is None
 
 
-@pytest.mark.asyncio
-async def test_end_session_clears_scope_and_permissions():
+def test_end_session_clears_scope_and_permissions():
     """End session should clear active session and permission cache."""
     permission_manager = _FakePermissionManager()
     service = SessionLifecycleService(permission_manager=permission_manager)
@@ -74,9 +78,8 @@ async def test_end_session_clears_scope_and_permissions():
 
 
 @pytest.mark.asyncio
-async def test_continue_session_with_existing_session_uses_run_command():
+async def test_continue_session_with_existing_session_uses_run_command(service):
     """Existing session should continue via run_command."""
-    service = SessionLifecycleService()
     claude_integration = SimpleNamespace(
         run_command=AsyncMock(
             return_value=SimpleNamespace(
@@ -91,7 +94,7 @@ async def test_continue_session_with_existing_session_uses_run_command():
     result = await service.continue_session(
         user_id=1001,
         scope_state=scope_state,
-        current_dir=Path("/tmp/project"),
+        current_dir=_PROJECT,
         claude_integration=claude_integration,
         prompt=None,
         default_prompt="default prompt",
@@ -103,16 +106,19 @@ async def test_continue_session_with_existing_session_uses_run_command():
     assert result.status == "continued"
     assert result.used_existing_session is True
     assert scope_state["claude_session_id"] == "sess-new-123"
-    claude_integration.run_command.assert_awaited_once()
-    assert (
-        claude_integration.run_command.await_args.kwargs["prompt"] == "default prompt"
+    claude_integration.run_command.assert_awaited_once_with(
+        prompt="default prompt",
+        working_directory=_PROJECT,
+        user_id=1001,
+        session_id="sess-old-123",
+        permission_handler=None,
     )
+    claude_integration.continue_session.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_continue_session_with_discovery_uses_continue_session():
+async def test_continue_session_with_discovery_uses_continue_session(service):
     """No active session should discover latest resumable session."""
-    service = SessionLifecycleService()
     claude_integration = SimpleNamespace(
         run_command=AsyncMock(),
         continue_session=AsyncMock(
@@ -127,7 +133,7 @@ async def test_continue_session_with_discovery_uses_continue_session():
     result = await service.continue_session(
         user_id=1002,
         scope_state=scope_state,
-        current_dir=Path("/tmp/project"),
+        current_dir=_PROJECT,
         claude_integration=claude_integration,
         prompt=None,
         default_prompt="default prompt",
@@ -139,20 +145,23 @@ async def test_continue_session_with_discovery_uses_continue_session():
     assert result.status == "continued"
     assert result.used_existing_session is False
     assert scope_state["claude_session_id"] == "sess-discovered-123"
-    claude_integration.continue_session.assert_awaited_once()
-    assert claude_integration.continue_session.await_args.kwargs["prompt"] is None
+    claude_integration.continue_session.assert_awaited_once_with(
+        user_id=1002,
+        working_directory=_PROJECT,
+        prompt=None,
+        permission_handler=None,
+    )
 
 
 @pytest.mark.asyncio
-async def test_continue_session_without_integration():
+async def test_continue_session_without_integration(service):
     """Missing claude integration should return unavailable status."""
-    service = SessionLifecycleService()
     scope_state = {"claude_session_id": None}
 
     result = await service.continue_session(
         user_id=1003,
         scope_state=scope_state,
-        current_dir=Path("/tmp/project"),
+        current_dir=_PROJECT,
         claude_integration=None,
         prompt=None,
         default_prompt="default prompt",
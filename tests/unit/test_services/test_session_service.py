@@ -2,21 +2,75 @@
 
 import tempfile
 import time
+from collections import OrderedDict
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, call
 
 import pytest
+import pytest_asyncio
 
-from src.claude.integration import ClaudeResponse
 from src.services import EventService, SessionService
 from src.storage.facade import Storage
 
+_APPROVED = Path("/tmp/project")
+_ACTIVE_EXPECTED = (
+    "Session: `sess-abc...`",
+    "Messages: 3",
+    "Turns: 2",
+    "Cost: `$0.1200`",
+    "Recent Session Events",
+)
+_EVENT_LINES_EXPECTED = (
+    "Recent Session Events",
+    "By Type:",
+    "`command_exec`",
+    "`assistant_text`",
+)
+_CODEX_PROCESS_MANAGER = SimpleNamespace(
+    _resolve_cli_path=lambda: "/usr/local/bin/codex",
+    _detect_cli_kind=lambda _: "codex",
+)
+
+
+def _build_claude_response(
+    session_id,
+    content="done",
+    cost=0.03,
+    duration_ms=1800,
+    num_turns=1,
+    tools_used=None,
+):
+    """Build a Claude response with defaults for fields a test does not care about."""
+    # Imported lazily: src.claude pulls in the agent SDK, which only the
+    # storage-backed tests need.
+    from src.claude.integration import ClaudeResponse
+
+    return ClaudeResponse(
+        content=content,
+        session_id=session_id,
+        cost=cost,
+        duration_ms=duration_ms,
+        num_turns=num_turns,
+        tools_used=tools_used or [],
+    )
+
+
+async def _fixed_event_lines(session_id: str):
+    """Event line provider for the active snapshot test session."""
+    assert session_id == "sess-abc"
+    return ["", "*Recent Session Events*", "Count: 2"]
+
 
-@pytest.fixture
-async def storage():
-    """Create test storage."""
-    with tempfile.TemporaryDirectory() as temp_dir:
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def storage(db_temp_root):
+    """Create test storage shared by this module.
+
+    Repositories commit on pooled connections, so a per-test SAVEPOINT
+    cannot roll their writes back; tests stay isolated by using distinct
+    user and session ids instead.
+    """
+    with tempfile.TemporaryDirectory(dir=db_temp_root) as temp_dir:
         db_path = Path(temp_dir) / "test.db"
         storage = Storage(f"sqlite:///{db_path}")
         await storage.initialize()
@@ -24,72 +78,73 @@ async def storage():
         await storage.close()
 
 
-@pytest.mark.asyncio
-async def test_event_service_builds_recent_summary(storage):
-    """Event service should summarize recent events by type."""
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def prewritten_sessions(storage):
+    """Write the read-only interactions used by the event summary tests once."""
     await storage.get_or_create_user(22001, "svc_user")
     await storage.create_session(22001, "/test/svc", "svc-session-1")
-
-    response = ClaudeResponse(
-        content="处理完成",
-        session_id="svc-session-1",
-        cost=0.12,
-        duration_ms=3200,
-        num_turns=2,
-        tools_used=[{"name": "Bash", "input": {"command": "pytest -q"}}],
-    )
     await storage.save_claude_interaction(
         user_id=22001,
         session_id="svc-session-1",
         prompt="帮我运行测试并总结结果",
-        response=response,
+        response=_build_claude_response(
+            "svc-session-1",
+            content="处理完成",
+            cost=0.12,
+            duration_ms=3200,
+            num_turns=2,
+            tools_used=[{"name": "Bash", "input": {"command": "pytest -q"}}],
+        ),
     )
 
-    service = EventService(storage)
-    summary = await service.get_recent_event_summary("svc-session-1", limit=20)
-
-    assert summary["count"] >= 5
-    assert summary["by_type"]["command_exec"] == 1
-    assert summary["by_type"]["assistant_text"] == 1
-    assert summary["by_type"]["tool_call"] == 1
-    assert summary["by_type"]["tool_result"] == 1
-    assert summary["latest_at"] is not None
-    assert summary["highlights"]
-
-
-@pytest.mark.asyncio
-async def test_session_service_context_event_lines(storage):
-    """Session service should render markdown lines for /context."""
     await storage.get_or_create_user(22002, "svc_user2")
     await storage.create_session(22002, "/test/svc2", "svc-session-2")
-
-    response = ClaudeResponse(
-        content="已完成最小修复。",
-        session_id="svc-session-2",
-        cost=0.03,
-        duration_ms=1800,
-        num_turns=1,
-    )
     await storage.save_claude_interaction(
         user_id=22002,
         session_id="svc-session-2",
         prompt="修复这个报错",
-        response=response,
+        response=_build_claude_response("svc-session-2", content="已完成最小修复。"),
+    )
+
+    return {"summary": "svc-session-1", "context": "svc-session-2"}
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_event_service_builds_recent_summary(storage, prewritten_sessions):
+    """Event service should summarize recent events by type."""
+    service = EventService(storage)
+    summary = await service.get_recent_event_summary(
+        prewritten_sessions["summary"], limit=20
     )
 
+    assert summary["count"] >= 5
+    expected_by_type = {
+        "command_exec": 1,
+        "assistant_text": 1,
+        "tool_call": 1,
+        "tool_result": 1,
+    }
+    assert expected_by_type.items() <= summary["by_type"].items()
+    assert summary["latest_at"] is not None
+    assert summary["highlights"]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_session_service_context_event_lines(storage, prewritten_sessions):
+    """Session service should render markdown lines for /context."""
     event_service = EventService(storage)
     session_service = SessionService(storage=storage, event_service=event_service)
-    lines = await session_service.get_context_event_lines("svc-session-2")
+    lines = await session_service.get_context_event_lines(
+        prewritten_sessions["context"]
+    )
 
     rendered = "\n".join(lines)
-    assert "Recent Session Events" in rendered
-    assert "By Type:" in rendered
-    assert "`command_exec`" in rendered
-    assert "`assistant_text`" in rendered
+    for text in _EVENT_LINES_EXPECTED:
+        assert text in rendered
     assert "Highlights:" not in rendered
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_session_service_context_event_lines_empty(storage):
     """Unknown session should return empty summary lines."""
     event_service = EventService(storage)
@@ -99,11 +154,9 @@ async def test_session_service_context_event_lines_empty(storage):
     assert lines == []
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_build_context_snapshot_for_active_session():
     """Unified snapshot should include context/session/event lines."""
-    approved = Path("/tmp/project")
-    current_dir = approved
     claude_integration = SimpleNamespace(
         get_precise_context_usage=AsyncMock(
             return_value={
@@ -125,35 +178,27 @@ async def test_build_context_snapshot_for_active_session():
         ),
     )
 
-    async def _event_lines_provider(session_id: str):
-        assert session_id == "sess-abc"
-        return ["", "*Recent Session Events*", "Count: 2"]
-
     snapshot = await SessionService.build_context_snapshot(
         user_id=3001,
         session_id="sess-abc",
-        current_dir=current_dir,
-        approved_directory=approved,
+        current_dir=_APPROVED,
+        approved_directory=_APPROVED,
         current_model="sonnet",
         claude_integration=claude_integration,
         include_resumable=True,
-        event_lines_provider=_event_lines_provider,
+        event_lines_provider=_fixed_event_lines,
     )
 
     rendered = "\n".join(snapshot.lines)
-    assert "Session: `sess-abc...`" in rendered
-    assert "Messages: 3" in rendered
-    assert "Turns: 2" in rendered
-    assert "Cost: `$0.1200`" in rendered
-    assert "Recent Session Events" in rendered
+    for text in _ACTIVE_EXPECTED:
+        assert text in rendered
     assert snapshot.precise_context is not None
     assert snapshot.session_info is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_build_context_snapshot_can_skip_precise_probe():
     """Context snapshot should skip /context probe when capability is disabled."""
-    approved = Path("/tmp/project")
     claude_integration = SimpleNamespace(
         get_precise_context_usage=AsyncMock(
             return_value={
@@ -176,8 +221,8 @@ async def test_build_context_snapshot_can_skip_precise_probe():
     snapshot = await SessionService.build_context_snapshot(
         user_id=3010,
         session_id="sess-no-probe",
-        current_dir=approved,
-        approved_directory=approved,
+        current_dir=_APPROVED,
+        approved_directory=_APPROVED,
         current_model="gpt-5",
         claude_integration=claude_integration,
         allow_precise_context_probe=False,
@@ -189,19 +234,20 @@ async def test_build_context_snapshot_can_skip_precise_probe():
     assert "Context (" in rendered
 
 
-@pytest.mark.asyncio
-async def test_build_context_snapshot_codex_without_precise_uses_status_hint():
-    """Codex should avoid rendering cumulative usage as current context when probe fails."""
-    approved = Path("/tmp/project")
-    process_manager = SimpleNamespace(
-        _resolve_cli_path=lambda: "/usr/local/bin/codex",
-        _detect_cli_kind=lambda _: "codex",
-    )
-    claude_integration = SimpleNamespace(
-        process_manager=process_manager,
+def _make_codex_integration(session_info):
+    """Build a Codex-backed integration stub without precise context usage."""
+    return SimpleNamespace(
+        process_manager=_CODEX_PROCESS_MANAGER,
         get_precise_context_usage=AsyncMock(return_value=None),
-        get_session_info=AsyncMock(
-            return_value={
+        get_session_info=AsyncMock(return_value=session_info),
+    )
+
+
+@pytest.mark.parametrize(
+    "session_info, probe_result, current_model, expected, unexpected, probe_awaits",
+    [
+        pytest.param(
+            {
                 "messages": 26,
                 "turns": 26,
                 "cost": 0.0,
@@ -210,55 +256,17 @@ async def test_build_context_snapshot_codex_without_precise_uses_status_hint():
                     "cached_input_tokens": 75_014_784,
                     "output_tokens": 319_348,
                 },
-            }
-        ),
-    )
-
-    snapshot = await SessionService.build_context_snapshot(
-        user_id=3011,
-        session_id="thread-codex-1",
-        current_dir=approved,
-        approved_directory=approved,
-        current_model="default",
-        claude_integration=claude_integration,
-        allow_precise_context_probe=True,
-    )
-
-    rendered = "\n".join(snapshot.lines)
-    assert "Context (/status)" in rendered
-    assert "请执行 `/status` 刷新" in rendered
-    assert "Cost:" not in rendered
-    assert "Tokens: `156,647,370`" not in rendered
-    claude_integration.get_precise_context_usage.assert_awaited_once()
-
-
-@pytest.mark.asyncio
-async def test_build_context_snapshot_codex_uses_local_snapshot_for_model_and_usage(
-    monkeypatch,
-):
-    """Codex /context should render model and usage from local session snapshot."""
-    approved = Path("/tmp/project")
-    process_manager = SimpleNamespace(
-        _resolve_cli_path=lambda: "/usr/local/bin/codex",
-        _detect_cli_kind=lambda _: "codex",
-    )
-    claude_integration = SimpleNamespace(
-        process_manager=process_manager,
-        get_precise_context_usage=AsyncMock(return_value=None),
-        get_session_info=AsyncMock(
-            return_value={
-                "messages": 37,
-                "turns": 37,
-                "cost": 0.0,
-                "model_usage": None,
-            }
+            },
+            None,
+            "default",
+            ("Context (/status)", "请执行 `/status` 刷新"),
+            ("Cost:", "Tokens: `156,647,370`"),
+            1,
+            id="without-precise-uses-status-hint",
         ),
-    )
-    monkeypatch.setattr(
-        SessionService,
-        "_probe_codex_session_snapshot",
-        staticmethod(
-            lambda _session_id: {
+        pytest.param(
+            {"messages": 37, "turns": 37, "cost": 0.0, "model_usage": None},
+            {
                 "used_tokens": 108_000,
                 "total_tokens": 258_400,
                 "remaining_tokens": 150_400,
@@ -272,76 +280,65 @@ async def test_build_context_snapshot_codex_uses_local_snapshot_for_model_and_us
                     "secondary": {"used_percent": 36.0, "window_minutes": 10_080},
                     "updated_at": "2026-02-14T09:06:49Z",
                 },
-            }
+            },
+            "default",
+            (
+                "Model: `gpt-5.3-codex (X High)`",
+                "Context (/status)",
+                "Usage: `108,000` / `258,400` (41.8%)",
+                "Usage Limits (/status)",
+                "5h window: `80.0% remaining`",
+                "7d window: `64.0% remaining`",
+            ),
+            ("Cost:",),
+            0,
+            id="uses-local-snapshot-for-model-and-usage",
         ),
-    )
-
-    snapshot = await SessionService.build_context_snapshot(
-        user_id=3012,
-        session_id="thread-codex-local",
-        current_dir=approved,
-        approved_directory=approved,
-        current_model="default",
-        claude_integration=claude_integration,
-        allow_precise_context_probe=True,
-    )
-
-    rendered = "\n".join(snapshot.lines)
-    assert "Model: `gpt-5.3-codex (X High)`" in rendered
-    assert "Context (/status)" in rendered
-    assert "Cost:" not in rendered
-    assert "Usage: `108,000` / `258,400` (41.8%)" in rendered
-    assert "Usage Limits (/status)" in rendered
-    assert "5h window: `80.0% remaining`" in rendered
-    assert "7d window: `64.0% remaining`" in rendered
-    claude_integration.get_precise_context_usage.assert_not_awaited()
-
-
-@pytest.mark.asyncio
-async def test_build_context_snapshot_codex_prefers_runtime_model_over_stale_state(
+        pytest.param(
+            {"messages": 1, "turns": 1, "cost": 0.0, "model_usage": None},
+            {"resolved_model": "gpt-5.3-codex", "reasoning_effort": "xhigh"},
+            "gpt-5.1-codex-mini",
+            ("Model: `gpt-5.3-codex (X High)`",),
+            (),
+            1,
+            id="prefers-runtime-model-over-stale-state",
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_build_context_snapshot_codex(
     monkeypatch,
+    session_info,
+    probe_result,
+    current_model,
+    expected,
+    unexpected,
+    probe_awaits,
 ):
-    """Codex should prefer latest runtime model over stale scoped model string."""
-    approved = Path("/tmp/project")
-    process_manager = SimpleNamespace(
-        _resolve_cli_path=lambda: "/usr/local/bin/codex",
-        _detect_cli_kind=lambda _: "codex",
-    )
-    claude_integration = SimpleNamespace(
-        process_manager=process_manager,
-        get_precise_context_usage=AsyncMock(return_value=None),
-        get_session_info=AsyncMock(
-            return_value={
-                "messages": 1,
-                "turns": 1,
-                "cost": 0.0,
-                "model_usage": None,
-            }
-        ),
-    )
+    """Codex /context should prefer the local session snapshot over probes."""
+    claude_integration = _make_codex_integration(session_info)
     monkeypatch.setattr(
         SessionService,
         "_probe_codex_session_snapshot",
-        staticmethod(
-            lambda _session_id: {
-                "resolved_model": "gpt-5.3-codex",
-                "reasoning_effort": "xhigh",
-            }
-        ),
+        staticmethod(lambda _session_id: probe_result),
     )
 
     snapshot = await SessionService.build_context_snapshot(
-        user_id=3013,
-        session_id="thread-codex-stale-model",
-        current_dir=approved,
-        approved_directory=approved,
-        current_model="gpt-5.1-codex-mini",
+        user_id=3011,
+        session_id="thread-codex-1",
+        current_dir=_APPROVED,
+        approved_directory=_APPROVED,
+        current_model=current_model,
         claude_integration=claude_integration,
         allow_precise_context_probe=True,
     )
 
     rendered = "\n".join(snapshot.lines)
-    assert "Model: `gpt-5.3-codex (X High)`" in rendered
+    for text in expected:
+        assert text in rendered
+    for text in unexpected:
+        assert text not in rendered
+    assert claude_integration.get_precise_context_usage.await_count == probe_awaits
 
 
 def test_get_cached_codex_snapshot_respects_ttl(monkeypatch):
@@ -356,14 +353,31 @@ def test_get_cached_codex_snapshot_respects_ttl(monkeypatch):
     assert first == sample_snapshot
 
     monkeypatch.setattr(
-        time,
-        "monotonic",
-        lambda: base_time + SessionService._codex_snapshot_ttl_seconds + 1,
+        SessionService,
+        "_now",
+        staticmethod(
+            lambda: base_time + SessionService._codex_snapshot_ttl_seconds + 1
+        ),
     )
     expired = SessionService.get_cached_codex_snapshot(session_id)
     assert expired is None
 
 
+def test_codex_snapshot_cache_evicts_least_recently_used(monkeypatch):
+    """Codex snapshot cache should stay bounded, keeping recently read entries."""
+    monkeypatch.setattr(SessionService, "_codex_snapshot_cache", OrderedDict())
+    monkeypatch.setattr(SessionService, "_codex_snapshot_cache_max_size", 2)
+    now = time.monotonic()
+
+    SessionService._store_codex_snapshot("first", now, {"used_tokens": 1})
+    SessionService._store_codex_snapshot("second", now, {"used_tokens": 2})
+    assert SessionService.get_cached_codex_snapshot("first") == {"used_tokens": 1}
+    SessionService._store_codex_snapshot("third", now, {"used_tokens": 3})
+
+    assert list(SessionService._codex_snapshot_cache) == ["first", "third"]
+    assert SessionService.get_cached_codex_snapshot("second") is None
+
+
 def test_parse_codex_rate_limits_extracts_primary_secondary():
     """Codex rate_limits payload should be normalized for status rendering."""
     parsed = SessionService._parse_codex_rate_limits(
@@ -390,25 +404,20 @@ def test_parse_codex_rate_limits_extracts_primary_secondary():
     assert parsed["updated_at"] == "2026-02-09T13:54:15.687000Z"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_build_context_snapshot_for_resumable_session():
     """No active session should show resumable info when available."""
-    approved = Path("/tmp/project")
-    current_dir = approved
     claude_integration = SimpleNamespace(
         _find_resumable_session=AsyncMock(
-            return_value=SimpleNamespace(
-                session_id="resume-12345678",
-                message_count=18,
-            )
+            return_value=SimpleNamespace(session_id="resume-12345678", message_count=18)
         )
     )
 
     snapshot = await SessionService.build_context_snapshot(
         user_id=3002,
         session_id=None,
-        current_dir=current_dir,
-        approved_directory=approved,
+        current_dir=_APPROVED,
+        approved_directory=_APPROVED,
         current_model=None,
         claude_integration=claude_integration,
         include_resumable=True,
@@ -420,64 +429,50 @@ async def test_build_context_snapshot_for_resumable_session():
     assert snapshot.resumable_payload is not None
 
 
-@pytest.mark.asyncio
-async def test_build_scope_context_snapshot_uses_scoped_state():
-    """Scope snapshot helper should map scope state into unified builder args."""
-    approved = Path("/tmp/project")
-    claude_integration = SimpleNamespace(
+@pytest.fixture(scope="module")
+def noop_claude_integration():
+    """Claude integration stub with no context usage or session info."""
+    return SimpleNamespace(
         get_precise_context_usage=AsyncMock(return_value=None),
         get_session_info=AsyncMock(return_value=None),
     )
-    provider_owner = SimpleNamespace(
-        get_context_event_lines=AsyncMock(return_value=["", "*Recent Session Events*"])
-    )
+
+
+@pytest.mark.parametrize(
+    "include_event_summary, expected_event_calls",
+    [(True, 1), (False, 0)],
+    ids=["with-events", "without-events"],
+)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_build_scope_context_snapshot_uses_scoped_state(
+    noop_claude_integration,
+    include_event_summary,
+    expected_event_calls,
+):
+    """Scope snapshot maps scope state and only queries events when enabled."""
     scope_state = {
         "claude_session_id": "scope-sess-001",
-        "current_directory": approved,
+        "current_directory": _APPROVED,
         "claude_model": "sonnet",
     }
+    provider_owner = SimpleNamespace(
+        get_context_event_lines=AsyncMock(return_value=["", "*Recent Session Events*"])
+    )
 
     snapshot = await SessionService.build_scope_context_snapshot(
         user_id=3003,
         scope_state=scope_state,
-        approved_directory=approved,
-        claude_integration=claude_integration,
+        approved_directory=_APPROVED,
+        claude_integration=noop_claude_integration,
         session_service=provider_owner,
         include_resumable=False,
-        include_event_summary=True,
+        include_event_summary=include_event_summary,
     )
 
     rendered = "\n".join(snapshot.lines)
     assert "Session: `scope-se...`" in rendered
-    assert "Recent Session Events" in rendered
-    provider_owner.get_context_event_lines.assert_awaited_once_with("scope-sess-001")
-
-
-@pytest.mark.asyncio
-async def test_build_scope_context_snapshot_skips_event_provider_when_disabled():
-    """Event provider should not be called when summary flag is disabled."""
-    approved = Path("/tmp/project")
-    claude_integration = SimpleNamespace(
-        get_precise_context_usage=AsyncMock(return_value=None),
-        get_session_info=AsyncMock(return_value=None),
+    assert ("Recent Session Events" in rendered) is include_event_summary
+    assert (
+        provider_owner.get_context_event_lines.await_args_list
+        == [call("scope-sess-001")] * expected_event_calls
     )
-    provider_owner = SimpleNamespace(
-        get_context_event_lines=AsyncMock(return_value=["", "*Recent Session Events*"])
-    )
-    scope_state = {
-        "claude_session_id": "scope-sess-002",
-        "current_directory": approved,
-        "claude_model": "sonnet",
-    }
-
-    await SessionService.build_scope_context_snapshot(
-        user_id=3004,
-        scope_state=scope_state,
-        approved_directory=approved,
-        claude_integration=claude_integration,
-        session_service=provider_owner,
-        include_resumable=False,
-        include_event_summary=False,
-    )
-
-    provider_owner.get_context_event_lines.assert_not_awaited()
@@ -1,6 +1,7 @@
 """Tests for database management."""
 
 import tempfile
+from contextlib import AsyncExitStack
 from pathlib import Path
 
 import pytest
@@ -36,6 +37,23 @@ class TestDatabaseManager:
                 await conn1.execute("SELECT 1")
                 await conn2.execute("SELECT 1")
 
+    async def test_connection_pragmas_apply_beyond_pool(self):
+        """Connections opened once the pool is empty get the PRAGMAs too."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(
+                f"sqlite:///{Path(temp_dir) / 'test.db'}",
+                connection_pragmas=["PRAGMA cache_size=-2000"],
+            )
+            await manager.initialize()
+            try:
+                async with AsyncExitStack() as stack:
+                    for _ in range(manager._pool_size + 1):
+                        conn = await stack.enter_async_context(manager.get_connection())
+                        cursor = await conn.execute("PRAGMA cache_size")
+                        assert (await cursor.fetchone())[0] == -2000
+            finally:
+                await manager.close()
+
     async def test_schema_creation(self, db_manager):
         """Test that schema is created properly."""
         async with db_manager.get_connection() as conn:
@@ -80,8 +98,8 @@ class TestDatabaseManager:
                 "idx_sessions_project_path",
                 "idx_messages_session_id",
                 "idx_messages_timestamp",
-                "idx_audit_log_user_id",
                 "idx_audit_log_timestamp",
+                "idx_audit_log_user_type_timestamp",
                 "idx_approval_requests_user_id",
                 "idx_approval_requests_session_id",
                 "idx_approval_requests_status",
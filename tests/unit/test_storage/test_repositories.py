@@ -1,10 +1,13 @@
 """Tests for repository implementations."""
 
+import shutil
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any, List
 
 import pytest
+import pytest_asyncio
 
 from src.storage.database import DatabaseManager
 from src.storage.models import (
@@ -26,13 +29,56 @@ from src.storage.repositories import (
     UserRepository,
 )
 
+# Throwaway test databases do not need crash-safe commits.
+_TEST_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+async def _assert_uses_index(
+    db_manager: DatabaseManager, sql: str, params: List[Any], index_name: str
+) -> None:
+    """Assert SQLite plans ``sql`` as a search on ``index_name``."""
+    async with db_manager.get_connection() as conn:
+        cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        details = [row["detail"] for row in await cursor.fetchall()]
+
+    assert any(
+        detail.startswith("SEARCH") and f"USING INDEX {index_name}" in detail
+        for detail in details
+    ), details
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def schema_template(db_temp_root):
+    """Run the migrations once into a template database file."""
+    with tempfile.TemporaryDirectory(dir=db_temp_root) as temp_dir:
+        template_path = Path(temp_dir) / "template.db"
+        manager = DatabaseManager(f"sqlite:///{template_path}")
+        await manager.initialize()
+        await manager.close()
+        yield template_path
+
 
 @pytest.fixture
-async def db_manager():
-    """Create test database manager."""
-    with tempfile.TemporaryDirectory() as temp_dir:
+async def db_manager(schema_template, db_temp_root):
+    """Create test database manager.
+
+    Kept per test: repositories commit on pooled connections, so a shared
+    manager could not roll a test's writes back with a SAVEPOINT. Each test
+    starts from a copy of the migrated template, so initialize() finds the
+    schema current and runs no DDL.
+    """
+    with tempfile.TemporaryDirectory(dir=db_temp_root) as temp_dir:
         db_path = Path(temp_dir) / "test.db"
-        manager = DatabaseManager(f"sqlite:///{db_path}")
+        shutil.copyfile(schema_template, db_path)
+        manager = DatabaseManager(
+            f"sqlite:///{db_path}", connection_pragmas=_TEST_PRAGMAS
+        )
         await manager.initialize()
         yield manager
         await manager.close()
@@ -158,8 +204,7 @@ class TestUserRepository:
 
         # Get allowed users
         allowed_users = await user_repo.get_allowed_users()
-        assert 12347 in allowed_users
-        assert 12348 not in allowed_users
+        assert allowed_users == [12347]
 
 
 class TestSessionRepository:
@@ -200,12 +245,13 @@ class TestSessionRepository:
 
     async def test_get_user_sessions(self, session_repo, user_repo):
         """Test getting user sessions."""
+        now = datetime.utcnow()
         # Create user
         user = UserModel(
             user_id=12350,
             telegram_username="multisessionuser",
-            first_seen=datetime.utcnow(),
-            last_active=datetime.utcnow(),
+            first_seen=now,
+            last_active=now,
             is_allowed=True,
         )
         await user_repo.create_user(user)
@@ -216,8 +262,8 @@ class TestSessionRepository:
                 session_id=f"test-session-{i}",
                 user_id=12350,
                 project_path=f"/test/project{i}",
-                created_at=datetime.utcnow(),
-                last_used=datetime.utcnow(),
+                created_at=now,
+                last_used=now,
             )
             await session_repo.create_session(session)
 
@@ -357,12 +403,13 @@ class TestToolUsageRepository:
 
     async def test_get_tool_stats(self, tool_repo, session_repo, user_repo):
         """Test getting tool statistics."""
+        now = datetime.utcnow()
         # Setup user and session
         user = UserModel(
             user_id=12354,
             telegram_username="statsuser",
-            first_seen=datetime.utcnow(),
-            last_active=datetime.utcnow(),
+            first_seen=now,
+            last_active=now,
             is_allowed=True,
         )
         await user_repo.create_user(user)
@@ -371,21 +418,25 @@ class TestToolUsageRepository:
             session_id="stats-session",
             user_id=12354,
             project_path="/test/stats",
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            created_at=now,
+            last_used=now,
         )
         await session_repo.create_session(session)
 
         # Create multiple tool usages
         tools = ["Read", "Write", "Read", "Edit", "Read"]
-        for tool in tools:
-            tool_usage = ToolUsageModel(
-                session_id="stats-session",
-                tool_name=tool,
-                timestamp=datetime.utcnow(),
-                success=True,
-            )
-            await tool_repo.save_tool_usage(tool_usage)
+        saved = await tool_repo.save_tool_usages(
+            [
+                ToolUsageModel(
+                    session_id="stats-session",
+                    tool_name=tool,
+                    timestamp=now,
+                    success=True,
+                )
+                for tool in tools
+            ]
+        )
+        assert saved == 5
 
         # Get tool stats
         stats = await tool_repo.get_tool_stats()
@@ -400,7 +451,7 @@ class TestToolUsageRepository:
 class TestApprovalRequestRepository:
     """Test approval request repository."""
 
-    async def test_create_and_resolve_request(self, approval_repo, db_manager):
+    async def test_create_and_resolve_request(self, approval_repo):
         """Pending request should transition once and remain idempotent."""
         request_id = "req-1234"
         created_at = datetime.utcnow()
@@ -430,23 +481,14 @@ class TestApprovalRequestRepository:
         )
         assert resolved_again is False
 
-        async with db_manager.get_connection() as conn:
-            cursor = await conn.execute(
-                """
-                SELECT status, decision, tool_name
-                FROM approval_requests
-                WHERE request_id = ?
-                """,
-                (request_id,),
-            )
-            row = await cursor.fetchone()
-
-        assert row is not None
-        assert row["status"] == "approved"
-        assert row["decision"] == "allow"
-        assert row["tool_name"] == "Bash"
+        request = await approval_repo.get_request(request_id)
+        assert request is not None
+        assert request.status == "approved"
+        assert request.decision == "allow"
+        assert request.tool_name == "Bash"
+        assert request.tool_input == {"command": "pytest"}
 
-    async def test_expire_all_pending(self, approval_repo, db_manager):
+    async def test_expire_all_pending(self, approval_repo):
         """Startup recovery should expire only pending rows."""
         now = datetime.utcnow()
         await approval_repo.create_request(
@@ -475,20 +517,10 @@ class TestApprovalRequestRepository:
         expired_count = await approval_repo.expire_all_pending(resolved_at=now)
         assert expired_count == 1
 
-        async with db_manager.get_connection() as conn:
-            pending_cursor = await conn.execute(
-                "SELECT status FROM approval_requests WHERE request_id = ?",
-                ("req-pending",),
-            )
-            pending_row = await pending_cursor.fetchone()
-            approved_cursor = await conn.execute(
-                "SELECT status FROM approval_requests WHERE request_id = ?",
-                ("req-approved",),
-            )
-            approved_row = await approved_cursor.fetchone()
-
-        assert pending_row["status"] == "expired"
-        assert approved_row["status"] == "approved"
+        pending = await approval_repo.get_request("req-pending")
+        approved = await approval_repo.get_request("req-approved")
+        assert pending.status == "expired"
+        assert approved.status == "approved"
 
 
 class TestSessionEventRepository:
@@ -569,7 +601,7 @@ class TestSessionEventRepository:
 class TestAuditLogRepository:
     """Test audit log repository filters."""
 
-    async def test_get_events_with_filters(self, audit_repo, user_repo):
+    async def test_get_events_with_filters(self, audit_repo, user_repo, db_manager):
         """Repository should support combined user/type/time filtering."""
         now = datetime.utcnow()
         await user_repo.create_user(
@@ -636,6 +668,17 @@ class TestAuditLogRepository:
         assert events[0].event_type == "command"
         assert events[0].event_data["command"] == "ls"
 
+        sql, params = audit_repo._build_events_query(
+            user_id=9001,
+            event_type="command",
+            start_time=now - timedelta(minutes=30),
+            end_time=None,
+            limit=20,
+        )
+        await _assert_uses_index(
+            db_manager, sql, params, "idx_audit_log_user_type_timestamp"
+        )
+
     async def test_get_security_violations(self, audit_repo, user_repo):
         """Security-violation query should filter by event_type."""
         now = datetime.utcnow()
@@ -685,12 +728,13 @@ class TestAnalyticsRepository:
         self, analytics_repo, message_repo, session_repo, user_repo
     ):
         """Test getting system statistics."""
+        now = datetime.utcnow()
         # Setup test data
         user = UserModel(
             user_id=12355,
             telegram_username="analyticsuser",
-            first_seen=datetime.utcnow(),
-            last_active=datetime.utcnow(),
+            first_seen=now,
+            last_active=now,
             is_allowed=True,
         )
         await user_repo.create_user(user)
@@ -699,8 +743,8 @@ class TestAnalyticsRepository:
             session_id="analytics-session",
             user_id=12355,
             project_path="/test/analytics",
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            created_at=now,
+            last_used=now,
         )
         await session_repo.create_session(session)
 
@@ -709,7 +753,7 @@ class TestAnalyticsRepository:
             message = MessageModel(
                 session_id="analytics-session",
                 user_id=12355,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 prompt=f"Test prompt {i}",
                 response=f"Test response {i}",
                 cost=0.1,